@@ -1,10 +1,45 @@
+import datetime
+import hashlib
+import json
 import os
+import pickle
+import re
+import shutil
+import socket
 import subprocess
 import sys
 import time
+import urllib.error
+import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+# 进程内 DNS 缓存：容器里通常没有本地 resolver 缓存，同一主机名的
+# 重复解析（连接重试、版本检查等）直接命中缓存，省掉一次 UDP 往返
+_getaddrinfo = socket.getaddrinfo
+
+@lru_cache(maxsize=32)
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    return _getaddrinfo(host, port, family, type, proto, flags)
+
+socket.getaddrinfo = _cached_getaddrinfo
+
+# 复用同一个连接池，避免每次探测都重新做 TCP+TLS 握手
+# （容器内可能没有 urllib3，此时退回标准库 urllib）
+try:
+    import urllib3
+    _HTTP = urllib3.PoolManager(
+        num_pools=4, maxsize=8,
+        retries=urllib3.Retry(total=1, connect=1, read=1, backoff_factor=0),
+    )
+except ImportError:
+    urllib3 = None
+    _HTTP = None
+
 # ==============================
 # 配置说明
 # ==============================
@@ -32,79 +67,358 @@ CONFIG_FILE = WORK_DIR / "config.yaml"
 CERT_FILE = WORK_DIR / "cert.crt"
 KEY_FILE = WORK_DIR / "cert.key"
 ENV_FILE = WORK_DIR / ".env"  # .env 文件也会在当前目录查找
+ENV_CACHE_FILE = WORK_DIR / ".env.cache.pkl"  # .env 解析结果缓存
+IP_CACHE_FILE = WORK_DIR / ".ip_cache"  # 公网 IP 缓存，避免每次重启都探测
+VER_CHECK_FILE = WORK_DIR / ".ver_check"  # mtime 记录上次版本检查时间
+API_ETAG_FILE = WORK_DIR / ".api_etag"  # GitHub release API 的 ETag
+BANNER_CACHE_FILE = WORK_DIR / ".last_banner.json"  # 上次横幅的参数指纹
+
+@dataclass(frozen=True)
+class Config:
+    """启动所需的全部环境配置，load_dotenv 之后一次性读取并校验"""
+    port: int
+    password: str
+    masquerade_url: str
+    fake_domain: str
+    node_name: str
+
+def load_config():
+    """读取并校验环境变量；校验失败立即退出，不浪费下载/证书工作"""
+    password = os.getenv("HY2_PASSWORD")
+    if not password:
+        print("\033[91m错误：HY2_PASSWORD 未设置！请在面板环境变量或 .env 文件中设置强密码\033[m")
+        sys.exit(1)
+
+    try:
+        port = int(os.getenv("HY2_PORT", "7102"))
+    except ValueError:
+        print("\033[91m错误：HY2_PORT 必须是数字\033[m")
+        sys.exit(1)
+
+    return Config(
+        port=port,
+        password=password,
+        masquerade_url=os.getenv("MASQUERADE_URL", "https://www.bing.com"),
+        fake_domain=os.getenv("FAKE_DOMAIN", "bing.com"),
+        node_name=os.getenv("HY2_NODE_NAME", "Hysteria2 Node").strip(),
+    )
+
+# 校验探测返回的确实是 IPv4 地址（明文源更要防劫持页/错误页污染）
+_IPV4_RE = re.compile(r'^\d{1,3}(\.\d{1,3}){3}$')
+
+# 一条正则整体扫描 .env（C 层执行），自动跳过空行和 # 注释行。
+# 键和原来的 split("=", 1) 一样宽松（允许 . - 等字符），
+# 行尾的 \r 一并吞掉，Windows 下编辑的 CRLF 文件不会把 \r 带进值里
+_ENV_RE = re.compile(rb'(?m)^[ \t]*([^#\s=][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$')
 
 def load_dotenv():
-    """加载 .env 文件（如果存在）"""
-    if ENV_FILE.exists():
-        print(".env 文件已检测到，正在加载...")
+    """加载 .env 文件（如果存在），解析结果按 (大小, mtime) 缓存"""
+    # 直接读、按 FileNotFoundError 判断不存在，省掉一次 exists() 的 stat
+    try:
+        data = ENV_FILE.read_bytes()
+    except FileNotFoundError:
+        return
+    print(".env 文件已检测到，正在加载...")
+    try:
+        # 重启循环里 .env 基本不变：缓存命中时一次 pickle.load 代替重新解析
+        st = ENV_FILE.stat()
+        cache_key = (st.st_size, st.st_mtime_ns)
         try:
-            for line in ENV_FILE.read_text().splitlines():
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    key, value = line.split("=", 1)
-                    os.environ[key.strip()] = value.strip()
-            print(".env 加载完成")
-        except Exception as e:
-            print(f".env 加载失败: {e}")
+            stored_key, env = pickle.loads(ENV_CACHE_FILE.read_bytes())
+            if stored_key == cache_key:
+                os.environ.update(env)
+                print(".env 加载完成（缓存命中）")
+                return
+        except Exception:
+            pass
+
+        env = {m.group(1).decode(): m.group(2).decode()
+               for m in _ENV_RE.finditer(data)}
+        os.environ.update(env)
+        try:
+            ENV_CACHE_FILE.write_bytes(pickle.dumps((cache_key, env)))
+        except OSError:
+            pass
+        print(".env 加载完成")
+    except Exception as e:
+        print(f".env 加载失败: {e}")
 
 def get_public_ip():
     """自动获取服务器公网 IPv4 地址（多备用源，提高成功率）"""
+    # 公网 IP 很少变化：缓存未过期时直接复用，省掉所有 HTTPS 握手
+    try:
+        ttl = int(os.getenv("IP_CACHE_TTL", "3600"))
+    except ValueError:
+        print("\033[91m警告：IP_CACHE_TTL 必须是数字，已使用默认值 3600\033[m")
+        ttl = 3600
+    try:
+        cached = json.loads(IP_CACHE_FILE.read_text())
+        if time.time() - cached["ts"] < ttl:
+            print(f"使用缓存的公网 IP：{cached['ip']}")
+            return cached["ip"]
+    except Exception:
+        pass
+
+    # 明文 HTTP 源放前面：拿公网 IP 不需要 TLS，省一次握手和证书校验
     ip_sources = [
+        "http://checkip.amazonaws.com",
+        "http://ifconfig.me/ip",
         "https://api.ipify.org",
-        "https://ifconfig.me",
         "https://icanhazip.com",
-        "https://ipinfo.io/ip",
-        "http://checkip.amazonaws.com"
+        "https://ipinfo.io/ip"
     ]
     
-    for source in ip_sources:
-        try:
-            with urllib.request.urlopen(source, timeout=5) as response:
-                ip = response.read().decode('utf-8').strip()
-                if ip:
-                    print(f"自动获取公网 IP 成功（来源: {source}）：{ip}")
-                    return ip
-        except Exception:
-            continue
-    
+    def _fetch(url):
+        if _HTTP is not None:
+            resp = _HTTP.request(
+                "GET", url,
+                timeout=urllib3.Timeout(connect=2.0, read=3.0),
+            )
+            return resp.data.decode('utf-8').strip()
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.read().decode('utf-8').strip()
+
+    # 并发探测所有来源，取最先返回的有效结果（串行最坏要等 5x5 秒）。
+    # 注意不能用 with：上下文退出的 shutdown(wait=True) 会等最慢的源
+    # 超时收尾，赢家就白赢了。拿到结果直接 shutdown(wait=False) 返回，
+    # 把还挂着的探测线程丢在后台（进程随后反正会 exec 掉）
+    executor = ThreadPoolExecutor(max_workers=len(ip_sources))
+    futures = {executor.submit(_fetch, url): url for url in ip_sources}
+    try:
+        for future in as_completed(futures, timeout=6):
+            try:
+                ip = future.result()
+            except Exception:
+                continue
+            if ip and _IPV4_RE.match(ip):
+                try:
+                    IP_CACHE_FILE.write_text(json.dumps({"ip": ip, "ts": time.time()}))
+                except OSError:
+                    pass
+                print(f"自动获取公网 IP 成功（来源: {futures[future]}）：{ip}")
+                return ip
+    except FuturesTimeout:
+        pass
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
     print("\033[91m自动获取公网 IP 失败（所有来源均不可达），请手动查看服务器 IP 并替换链接中的地址\033[m")
     return "你的服务器IP"
 
+class _RedirectRecorder(urllib.request.HTTPRedirectHandler):
+    """记录重定向链上每一跳 URL 的 handler（urlopen 只暴露最终 URL）"""
+    def __init__(self):
+        self.urls = []
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        self.urls.append(newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+def _stream_download(url, dest):
+    """流式下载到 dest（1 MiB 块、8 MiB 写缓冲，写完 fsync）
+
+    返回重定向链上经过的所有 URL：GitHub release 的版本号只出现在
+    中间那跳（/releases/download/<tag>/...），最终资产 URL 在
+    objects.githubusercontent.com 上，路径里没有版本号。
+    """
+    if _HTTP is not None:
+        resp = _HTTP.request(
+            "GET", url, preload_content=False,
+            timeout=urllib3.Timeout(connect=3.0, read=30.0),
+        )
+        try:
+            with open(dest, "wb", buffering=8 * 1024 * 1024) as f:
+                shutil.copyfileobj(resp, f, length=1024 * 1024)
+                f.flush()
+                os.fsync(f.fileno())
+            urls = [url]
+            for hop in getattr(resp.retries, "history", None) or ():
+                if hop.redirect_location:
+                    urls.append(hop.redirect_location)
+            urls.append(resp.geturl())
+            return urls
+        finally:
+            resp.release_conn()
+    else:
+        recorder = _RedirectRecorder()
+        opener = urllib.request.build_opener(recorder)
+        with opener.open(url, timeout=30) as resp:
+            with open(dest, "wb", buffering=8 * 1024 * 1024) as f:
+                shutil.copyfileobj(resp, f, length=1024 * 1024)
+                f.flush()
+                os.fsync(f.fileno())
+            return [url] + recorder.urls
+
+def _check_latest_tag(binary):
+    """若上游发布了新版本则返回 (tag, etag)，已是最新（或无法确认）返回 None
+
+    检查结果按 24 小时缓存在 .ver_check 的 mtime 上，期间完全不碰网络；
+    过期后带 If-None-Match 查一次 GitHub release API，304 即最新，否则
+    把返回的 tag 与二进制上的 user.hy2_version 扩展属性比对。网络或解析
+    失败时保守按最新处理，不拖慢启动也不误删能用的二进制。
+
+    检测到新版本时 .api_etag 不在这里落盘，而是随 (tag, etag) 交给调用方
+    在升级装好之后写：提前写的话，下载一旦失败，下次启动的条件请求会
+    304 误判“已是最新”，升级就被悄悄丢掉了。
+    """
+    try:
+        if time.time() - os.stat(VER_CHECK_FILE).st_mtime < 86400:
+            return None
+    except FileNotFoundError:
+        pass
+
+    api_url = "https://api.github.com/repos/apernet/hysteria/releases/latest"
+    headers = {"Accept": "application/vnd.github+json"}
+    try:
+        headers["If-None-Match"] = API_ETAG_FILE.read_text().strip()
+    except OSError:
+        pass
+
+    try:
+        if _HTTP is not None:
+            resp = _HTTP.request(
+                "GET", api_url, headers=headers,
+                timeout=urllib3.Timeout(connect=2.0, read=5.0),
+            )
+            status, body, etag = resp.status, resp.data, resp.headers.get("ETag")
+        else:
+            req = urllib.request.Request(api_url, headers=headers)
+            try:
+                with urllib.request.urlopen(req, timeout=5) as resp:
+                    status, body, etag = resp.status, resp.read(), resp.headers.get("ETag")
+            except urllib.error.HTTPError as e:
+                if e.code != 304:
+                    raise
+                status, body, etag = 304, b"", None
+
+        if status == 304:
+            VER_CHECK_FILE.touch()
+            return None
+
+        tag = json.loads(body).get("tag_name", "")
+        try:
+            current = os.getxattr(binary, "user.hy2_version").decode()
+        except OSError:
+            current = ""
+        if not tag or tag == current:
+            # 确认本地已是最新，ETag 此时才能安全落盘
+            if etag:
+                API_ETAG_FILE.write_text(etag)
+            VER_CHECK_FILE.touch()
+            return None
+        return tag, etag
+    except Exception:
+        return None
+
 def download_hysteria2():
     """下载最新版 Hysteria2 二进制"""
     arch = os.getenv("ARCH", "amd64").lower()
     binary_name = f"hysteria-linux-{arch}"
-    
+
+    update = None
     if HY2_BINARY.exists():
-        print(f"Hysteria2 二进制已存在（{binary_name}），跳过下载")
-        return
+        update = _check_latest_tag(HY2_BINARY)
+        if update is None:
+            print(f"Hysteria2 二进制已存在（{binary_name}），跳过下载")
+            return
+        latest_tag, api_etag = update
+        print(f"检测到新版本 {latest_tag}，重新下载 {binary_name}...")
+    else:
+        latest_tag, api_etag = "", None
+        print(f"正在下载最新版 Hysteria2 ({binary_name})...")
 
-    print(f"正在下载最新版 Hysteria2 ({binary_name})...")
     url = f"https://github.com/apernet/hysteria/releases/latest/download/{binary_name}"
+    temp_binary = WORK_DIR / "temp-binary"
     try:
-        urllib.request.urlretrieve(url, HY2_BINARY)
-        HY2_BINARY.chmod(0o755)
+        redirect_urls = _stream_download(url, temp_binary)
+        temp_binary.chmod(0o755)
+        os.replace(temp_binary, HY2_BINARY)
+        # 首次下载没查过 API，从重定向链的中间跳里解析版本号；
+        # 不打戳的话 24 小时后的版本检查必然比对不上、白白重下一遍。
+        # URL 里 tag 是百分号编码的（app%2Fv2.6.2），unquote 之后
+        # 才能和 API 的 tag_name（app/v2.6.2）比对
+        if not latest_tag:
+            for hop_url in redirect_urls:
+                m = re.search(r"/releases/download/([^/]+)/", hop_url)
+                if m:
+                    latest_tag = urllib.parse.unquote(m.group(1))
+                    break
+        # 版本号写进扩展属性，供下次检查比对（文件系统不支持 xattr 时忽略）
+        if latest_tag:
+            try:
+                os.setxattr(HY2_BINARY, "user.hy2_version", latest_tag.encode())
+            except OSError:
+                pass
+        # 升级确认装好，API 的 ETag 这时才能落盘（见 _check_latest_tag）
+        if api_etag:
+            API_ETAG_FILE.write_text(api_etag)
+        VER_CHECK_FILE.touch()
         print("下载完成")
     except Exception as e:
+        temp_binary.unlink(missing_ok=True)
+        if update is not None:
+            # 升级下载失败但旧二进制还能用：继续跑旧版，
+            # 别为一次 GitHub 抖动把在跑的节点打进崩溃重启循环
+            print(f"\033[91m新版本下载失败，继续使用现有二进制: {e}\033[m")
+            return
         print(f"下载失败（可能架构错误？当前设置: {arch}）: {e}")
         sys.exit(1)
 
-def generate_self_signed_cert():
+def _generate_cert_inprocess(fake_domain):
+    """用 cryptography 库在进程内生成 Ed25519 自签证书
+
+    Ed25519 密钥生成比 RSA-2048 快几个数量级，而且省掉 fork openssl
+    子进程的开销；Hysteria2/QUIC 客户端均支持 Ed25519 证书。
+    """
+    from cryptography import x509
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519
+    from cryptography.x509.oid import NameOID
+
+    key = ed25519.Ed25519PrivateKey.generate()
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, fake_domain)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=36500))
+        .sign(key, None)
+    )
+    KEY_FILE.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    CERT_FILE.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+
+def generate_self_signed_cert(cfg):
     """生成自签证书（如果不存在）"""
-    if CERT_FILE.exists() and KEY_FILE.exists():
+    try:
+        os.stat(CERT_FILE)
+        os.stat(KEY_FILE)
         print("自签证书已存在，跳过生成")
         return
+    except FileNotFoundError:
+        pass
 
     print("正在生成自签证书...")
+    fake_domain = cfg.fake_domain
     try:
-        fake_domain = os.getenv("FAKE_DOMAIN", "bing.com")
-        subprocess.run([
-            "openssl", "req", "-x509", "-nodes", "-days", "36500",
-            "-newkey", "rsa:2048",
-            "-keyout", str(KEY_FILE),
-            "-out", str(CERT_FILE),
-            "-subj", f"/CN={fake_domain}"
-        ], check=True)
+        try:
+            _generate_cert_inprocess(fake_domain)
+        except ImportError:
+            # 没有 cryptography 库时退回 openssl 子进程
+            subprocess.run([
+                "openssl", "req", "-x509", "-nodes", "-days", "36500",
+                "-newkey", "rsa:2048",
+                "-keyout", str(KEY_FILE),
+                "-out", str(CERT_FILE),
+                "-subj", f"/CN={fake_domain}"
+            ], check=True)
         KEY_FILE.chmod(0o600)
         CERT_FILE.chmod(0o644)
         print("自签证书生成完成")
@@ -112,27 +426,12 @@ def generate_self_signed_cert():
         print(f"证书生成失败（可能缺少 openssl）: {e}")
         sys.exit(1)
 
-def generate_config():
-    """生成 Hysteria2 配置文件"""
-    port = os.getenv("HY2_PORT", "7102")
-    password = os.getenv("HY2_PASSWORD")
-    masquerade_url = os.getenv("MASQUERADE_URL", "https://www.bing.com")
-    
-    if not password:
-        print("\033[91m错误：HY2_PASSWORD 未设置！请在面板环境变量或 .env 文件中设置强密码\033[m")
-        sys.exit(1)
-    
-    try:
-        port = int(port)
-    except ValueError:
-        print("\033[91m错误：HY2_PORT 必须是数字\033[m")
-        sys.exit(1)
-    
-    config_content = f"""listen: :{port}
+# 配置模板在模块加载时构建一次，生成时只做 format_map 填充
+_CFG_TMPL = """listen: :{port}
 
 tls:
-  cert: {CERT_FILE}
-  key: {KEY_FILE}
+  cert: {cert}
+  key: {key}
 
 auth:
   type: password
@@ -144,53 +443,111 @@ masquerade:
     url: {masquerade_url}
     rewriteHost: true
 """
-    CONFIG_FILE.write_text(config_content)
+
+def generate_config(cfg):
+    """生成 Hysteria2 配置文件"""
+    config_content = _CFG_TMPL.format_map({
+        "port": cfg.port,
+        "cert": CERT_FILE,
+        "key": KEY_FILE,
+        "password": cfg.password,
+        "masquerade_url": cfg.masquerade_url,
+    })
+
+    # 内容没变就不重写，避免无谓的磁盘写
+    try:
+        if CONFIG_FILE.read_text() == config_content:
+            print("配置文件未变化，跳过写入")
+            return
+    except OSError:
+        pass
+
+    # 先写临时文件再原子替换，避免服务启动时读到写了一半的配置
+    tmp = CONFIG_FILE.with_suffix(".tmp")
+    tmp.write_text(config_content)
+    os.replace(tmp, CONFIG_FILE)
     print("配置文件已生成")
 
-def run_hysteria2():
+def run_hysteria2(cfg):
     """运行 Hysteria2 服务"""
     public_ip = get_public_ip()
-    port = os.getenv("HY2_PORT", "7102")
-    password = os.getenv("HY2_PASSWORD", "[未设置]")
-    fake_domain = os.getenv("FAKE_DOMAIN", "bing.com")
-    hy2_node_name = os.getenv("HY2_NODE_NAME", "Hysteria2 Node").strip()
-    
+    port = cfg.port
+    password = cfg.password
+    fake_domain = cfg.fake_domain
+    hy2_node_name = cfg.node_name
+
     # 构建链接（如果有节点名称，则添加 #节点名称）
     base_url = f"hysteria2://{password}@{public_ip}:{port}/?sni={fake_domain}&insecure=1"
     client_url = f"{base_url}#{hy2_node_name}" if hy2_node_name else base_url
-    
-    print(f"\n=== Hysteria2 服务器启动成功 ===")
-    print(f"监听端口: {port}")
-    print(f"公网 IP: {public_ip}")
-    print(f"节点名称: {hy2_node_name}")
-    print(f"工作目录: {WORK_DIR}\n")
-    
-    print("客户端连接链接（自签证书，需要允许不安全）：")
-    print(f"\n\033[92m{client_url}\033[m\n")
-    
-    print("提示：")
-    print("- 可直接复制上方链接导入 v2rayNG / NekoBox / Clash Meta 等客户端")
-    print("- 节点将在客户端显示为：{}".format(hy2_node_name if hy2_node_name else "默认名称"))
-    print("- 如果 IP 获取失败，请手动替换链接中的“你的服务器IP”")
-    print("- 日志输出开始（面板重启会自动运行）\n")
 
-    subprocess.run([str(HY2_BINARY), "server", "-c", str(CONFIG_FILE)])
+    # 参数指纹没变的重启（崩溃后面板自动拉起）只打一行，
+    # 不往日志收集器重复刷整块横幅
+    banner_key = hashlib.blake2b(
+        f"{public_ip}|{port}|{password}|{fake_domain}|{hy2_node_name}".encode(),
+        digest_size=8,
+    ).hexdigest()
+    try:
+        cached_key = json.loads(BANNER_CACHE_FILE.read_text()).get("key")
+    except Exception:
+        cached_key = None
+
+    if cached_key == banner_key:
+        sys.stdout.write(f"启动参数未变化，连接链接同上：\033[92m{client_url}\033[m\n")
+    else:
+        # 合并为一次 write：stdout 接到面板日志管道时，逐条 print 每条都是一次系统调用
+        banner = "\n".join([
+            "",
+            "=== Hysteria2 服务器启动成功 ===",
+            f"监听端口: {port}",
+            f"公网 IP: {public_ip}",
+            f"节点名称: {hy2_node_name}",
+            f"工作目录: {WORK_DIR}",
+            "",
+            "客户端连接链接（自签证书，需要允许不安全）：",
+            "",
+            f"\033[92m{client_url}\033[m",
+            "",
+            "提示：",
+            "- 可直接复制上方链接导入 v2rayNG / NekoBox / Clash Meta 等客户端",
+            "- 节点将在客户端显示为：{}".format(hy2_node_name if hy2_node_name else "默认名称"),
+            "- 如果 IP 获取失败，请手动替换链接中的“你的服务器IP”",
+            "- 日志输出开始（面板重启会自动运行）",
+            "",
+        ])
+        sys.stdout.write(banner + "\n")
+        try:
+            BANNER_CACHE_FILE.write_text(json.dumps({"key": banner_key}))
+        except OSError:
+            pass
+
+    # 用 execvp 直接替换当前进程：释放 Python 解释器占用的内存，
+    # 信号也直达 hysteria。exec 不会返回，先把缓冲输出刷掉
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvp(str(HY2_BINARY), [str(HY2_BINARY), "server", "-c", str(CONFIG_FILE)])
 
 def main():
     # 无需 os.chdir，因为已经使用 Path.cwd() 作为工作目录
     
-    print("=== Hysteria2 容器专用启动脚本（工作目录为当前路径）===")
-    print(f"当前工作目录: {WORK_DIR}")
-    
+    sys.stdout.write(
+        "=== Hysteria2 容器专用启动脚本（工作目录为当前路径）===\n"
+        f"当前工作目录: {WORK_DIR}\n"
+    )
+
     load_dotenv()
-    
-    download_hysteria2()
-    generate_self_signed_cert()
-    generate_config()
-    
-    time.sleep(2)
-    
-    run_hysteria2()
+    cfg = load_config()
+
+    # 二进制下载与证书生成互不依赖，并行执行（总耗时取两者较大值）
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        download_future = executor.submit(download_hysteria2)
+        cert_future = executor.submit(generate_self_signed_cert, cfg)
+        download_future.result()
+        cert_future.result()
+
+    generate_config(cfg)
+
+    # 证书/配置都是同步写入，二进制下载也已 fsync，无需再等待
+    run_hysteria2(cfg)
 
 if __name__ == "__main__":
     main()